@@ -1,5 +1,5 @@
 from typing import Dict
-from pydantic import BaseModel
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 # Database configurations
 DATABASES: Dict[str, Dict[str, str]] = {
@@ -9,12 +9,19 @@ DATABASES: Dict[str, Dict[str, str]] = {
         "username": "AI_lead_gen",
         "password": "Cedar123",
         "database": "lead_generation",
-        "driver": "ODBC Driver 17 for SQL Server"
+        "driver": "ODBC Driver 17 for SQL Server",
+        "packet_size": "32767"  # Max TDS packet size, fewer round-trips on large results
     },
 }
 
 # API Configuration
-class Settings(BaseModel):
+class Settings(BaseSettings):
+    """
+    Application settings, overridable via environment variables or .env
+    (e.g. DB_POOL_SIZE=5, UVICORN_WORKERS=2).
+    """
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    
     app_name: str = "Lead Generation API"
     version: str = "1.0.0"
     debug: bool = False
@@ -22,5 +29,29 @@ class Settings(BaseModel):
     # Pagination defaults
     default_page_size: int = 10
     max_page_size: int = 100
+    
+    # Connection pool, sized per worker process. Keep
+    # UVICORN_WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) within the MSSQL
+    # server's max connections.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30  # Seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
+    db_pool_pre_ping: bool = False  # Ping on checkout; costs a round-trip per request
+    
+    # Read company_slug from the database instead of computing it per request.
+    # Enable once the column exists and scripts/backfill_company_slugs.py has run.
+    use_stored_slugs: bool = False
+    
+    # In-process response cache for read endpoints, budgeted in bytes of
+    # response body per cache and per worker
+    response_cache_bytes: int = 16 * 1024 * 1024
+    response_cache_ttl: int = 60  # Seconds
+    
+    # Server
+    uvicorn_workers: int = 2
+    # Threads available to sync endpoints/dependencies (anyio defaults to 40).
+    # DB-touching handlers stay async def and never use this pool.
+    thread_limiter_tokens: int = 100
 
 settings = Settings()
\ No newline at end of file
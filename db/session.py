@@ -1,11 +1,15 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
-from typing import AsyncGenerator
-from config import DATABASES
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from typing import Dict, Tuple
+from config import DATABASES, settings
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
 
+# One engine (and therefore one connection pool) per database key
+_ENGINES: Dict[str, Tuple[AsyncEngine, async_sessionmaker]] = {}
+
 def get_connection_string(db_key: str) -> str:
     """
     Constructs the database connection string for SQLAlchemy
@@ -13,50 +17,84 @@ def get_connection_string(db_key: str) -> str:
     try:
         db = DATABASES[db_key]
         driver = db["driver"].replace(" ", "+")
-        return f"{db['type']}://{db['username']}:{db['password']}@{db['server']}/{db['database']}?driver={driver}"
+        connection_string = f"{db['type']}://{db['username']}:{db['password']}@{db['server']}/{db['database']}?driver={driver}"
+        if db.get("packet_size"):
+            connection_string += f"&Packet+Size={db['packet_size']}"
+        return connection_string
     except KeyError as e:
         logger.error(f"Database configuration not found for key: {db_key}")
         raise ValueError(f"Invalid database key: {db_key}") from e
 
-def create_engine_and_session(db_key: str):
+def _build_engine_and_session(db_key: str) -> Tuple[AsyncEngine, async_sessionmaker]:
     """
-    Creates and returns a SQLAlchemy async engine and sessionmaker
-    for a given database key from config.
+    Builds a new SQLAlchemy async engine and sessionmaker for a database key.
     """
     connection_string = get_connection_string(db_key)
     
     engine = create_async_engine(
         connection_string,
-        pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        query_cache_size=1200,  # Compiled SQL cache, above the default 500
         echo=False  # Set to True for SQL query logging in development
     )
     
-    session_local = sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False
-    )
+    session_local = async_sessionmaker(engine, expire_on_commit=False)
     
     return engine, session_local
 
-def get_db_factory(db_key: str):
+def create_engine_and_session(db_key: str) -> Tuple[AsyncEngine, async_sessionmaker]:
+    """
+    Returns the SQLAlchemy async engine and sessionmaker for a given
+    database key from config, creating them on first use.
+    """
+    if db_key not in _ENGINES:
+        _ENGINES[db_key] = _build_engine_and_session(db_key)
+    return _ENGINES[db_key]
+
+def get_session_local(db_key: str) -> async_sessionmaker:
     """
-    Returns a dependency function for FastAPI to inject a DB session
-    tied to the given db_key.
+    Returns the shared sessionmaker for a database key, for handlers that
+    open sessions explicitly with `async with get_session_local(key)() as session`.
+    Call it at request time rather than import time, so importing a router
+    does not build an engine.
     """
     _, session_local = create_engine_and_session(db_key)
-    
-    async def get_db() -> AsyncGenerator[AsyncSession, None]:
-        async with session_local() as session:
-            try:
-                yield session
-            except Exception as e:
-                logger.error(f"Database session error: {str(e)}")
-                await session.rollback()
+    return session_local
+
+async def dispose_engines() -> None:
+    """
+    Disposes every cached engine and releases their pooled connections.
+    Engines stay cached, so sessionmakers handed out earlier remain valid.
+    """
+    for db_key, (engine, _) in _ENGINES.items():
+        await engine.dispose()
+        logger.info(f"Disposed database engine for key: {db_key}")
+
+def is_connection_invalidated(exc: BaseException) -> bool:
+    """
+    Returns True if the exception means the pooled connection was dropped
+    (e.g. closed by the server) and the operation can be retried.
+    """
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+def retry_on_disconnect(func):
+    """
+    Retries an async handler once when its database connection was invalidated.
+    Stale pooled connections are no longer pinged on checkout, so the first
+    request on a dropped connection fails and is retried on a fresh one.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except DBAPIError as e:
+            if not e.connection_invalidated:
                 raise
-            finally:
-                await session.close()
+            logger.warning(f"Database connection invalidated in {func.__name__}, retrying: {str(e)}")
+            return await func(*args, **kwargs)
     
-    return get_db
\ No newline at end of file
+    return wrapper
@@ -1,10 +1,12 @@
 from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import anyio.to_thread
 import logging
 from contextlib import asynccontextmanager
 
 from routers.company import router as company_router
+from db.session import create_engine_and_session, dispose_engines
 from config import settings
 
 # Configure logging
@@ -21,9 +23,12 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info(f"Starting {settings.app_name} v{settings.version}")
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_limiter_tokens
+    create_engine_and_session("lead_generation")
     yield
     # Shutdown
     logger.info("Shutting down application")
+    await dispose_engines()
 
 # Create FastAPI app
 app = FastAPI(
@@ -63,5 +68,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True if settings.debug else False,
+        workers=None if settings.debug else settings.uvicorn_workers,  # reload only supports one worker
         log_level="info"
     )
\ No newline at end of file
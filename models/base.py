@@ -0,0 +1,5 @@
+from sqlalchemy.orm import DeclarativeBase
+
+class Base(DeclarativeBase):
+    """Shared declarative base; every model registers on this one MetaData"""
+    pass
@@ -1,15 +1,28 @@
-from sqlalchemy import Column, String, Text, Date, Boolean, BigInteger
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, String, Text, Date, Boolean, BigInteger, Index, text
+from sqlalchemy.orm import deferred
 
-Base = declarative_base()
+from models.base import Base
 
 class Company(Base):
     __tablename__ = "company"
-    __table_args__ = {"schema": "dbo"}  # MSSQL schema
+    __table_args__ = (
+        # Name index for the list's search predicate, ORDER BY and COUNT. It does not
+        # cover the list itself: pain_points, buying_triggers (nvarchar(max)) still
+        # need a key lookup per returned row. Searches use the column's own
+        # collation (case-insensitive by default on MSSQL); a COLLATE clause in
+        # the predicate would prevent the seek.
+        Index(
+            "ix_company_name_ci",
+            "company_name",
+            mssql_include=["company_website", "market_size", "company_size", "revenue_threshold"]
+        ),
+        Index("ix_company_slug", "company_slug", unique=True, mssql_where=text("company_slug IS NOT NULL")),
+        {"schema": "dbo"}  # MSSQL schema
+    )
     
     co_rowid = Column(BigInteger, primary_key=True, index=True)
     # Map to actual company name field - assuming the table has both ID and name fields
-    company_name = Column(String(500), nullable=False, index=True)
+    company_name = Column(String(500), nullable=False)  # Indexed by ix_company_name_ci
     company_website = Column(String(255), nullable=True)
     linkedin_company_url = Column(String(2048), nullable=True)
     is_profiled = Column(Boolean, nullable=True, default=False)
@@ -18,4 +31,7 @@ class Company(Base):
     revenue_threshold = Column(Text, nullable=True)  # nvarchar(max) maps to Text
     pain_points = Column(Text, nullable=True)  # nvarchar(max) maps to Text
     buying_triggers = Column(Text, nullable=True)  # nvarchar(max) maps to Text
-    last_profiled_on = Column(Date, nullable=True)  # date type
\ No newline at end of file
+    last_profiled_on = Column(Date, nullable=True)  # date type
+    # Slug stored at write time (see scripts/backfill_company_slugs.py). Deferred so
+    # entity loads never select it; only read when settings.use_stored_slugs is on.
+    company_slug = deferred(Column(String(600), nullable=True))
@@ -1,29 +1,386 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, text
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from sqlalchemy import Row, Select, select, func, text, and_, not_, or_
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+import asyncio
 import logging
 import math
+import msgspec
+import orjson
 
-from db.session import get_db_factory
+from db.session import get_session_local, is_connection_invalidated, retry_on_disconnect
 from models.models import Company
-from schemas.schemas import CompanyListResponse, CompanyListItem, PaginationParams
-from utils.slug_utils import generate_slug
+from schemas.schemas import CompanyListResponse, CompanyListItemStruct, PaginationParams
+from utils.cache_utils import AsyncTTLCache
+from utils.slug_utils import SLUG_DELETED_CHARS, SLUG_SYMBOL_REPLACEMENTS, UNNAMED_SLUG, generate_slug, generate_slugs, slug_to_like_pattern
 from config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-# Inject DB session for lead_generation
-get_lead_db = get_db_factory("lead_generation")
+DESCRIPTION_MAX_LENGTH = 200
+
+_ITEM_ENCODER = msgspec.json.Encoder()
+
+# Serialized responses for repeated identical requests; per-worker, so entries may
+# lag database changes by up to settings.response_cache_ttl seconds
+_company_list_cache = AsyncTTLCache(max_bytes=settings.response_cache_bytes, ttl=settings.response_cache_ttl)
+_company_detail_cache = AsyncTTLCache(max_bytes=settings.response_cache_bytes, ttl=settings.response_cache_ttl)
+
+# Invariant statements, built once; handlers derive filtered/paged copies from them
+# The list page selects only the columns it renders, so rows come back as plain tuples
+# without ORM instance hydration
+_COMPANY_LIST_COLUMNS = (
+    Company.company_name,
+    Company.company_website,
+    Company.market_size,
+    Company.company_size,
+    Company.revenue_threshold,
+    Company.pain_points,
+    Company.buying_triggers,
+    Company.co_rowid,
+) + ((Company.company_slug,) if settings.use_stored_slugs else ())
+# OFFSET pages carry the filtered total as a window column. Keyset pages must not,
+# since the window count would scan every row past the cursor.
+_COMPANY_PAGE_STMT = select(*_COMPANY_LIST_COLUMNS, func.count().over().label("total"))
+_COMPANY_SEEK_STMT = select(*_COMPANY_LIST_COLUMNS)
+_COMPANY_LIST_ORDER = (Company.company_name, Company.co_rowid)
+_COMPANY_COUNT_STMT = select(func.count(Company.co_rowid))
+_COMPANY_SCAN_STMT = select(Company).order_by(Company.co_rowid).execution_options(yield_per=500)
+_COMPANY_BY_SLUG_STMT = select(Company).limit(1)
+
+# Accent-insensitive, so "cafe" in a slug matches "Café". The slug prefilter is a
+# '%token%' scan either way, so collating it costs no index seek.
+SLUG_MATCH_COLLATION = "Latin1_General_CI_AI"
+
+def _build_slug_match_name():
+    """Company name with generate_slug's symbol and punctuation rewrites applied in SQL"""
+    # TRANSLATE (SQL Server 2017+) maps every deleted character to the first one,
+    # so a single REPLACE removes them all instead of one nested REPLACE each
+    marker = SLUG_DELETED_CHARS[0]
+    name = func.replace(
+        func.translate(Company.company_name, SLUG_DELETED_CHARS, marker * len(SLUG_DELETED_CHARS)),
+        marker,
+        ""
+    )
+    for symbol, word in SLUG_SYMBOL_REPLACEMENTS:
+        name = func.replace(name, symbol, word)
+    return name.collate(SLUG_MATCH_COLLATION)
+
+_COMPANY_SLUG_MATCH_NAME = _build_slug_match_name()
+
+# Fallback candidates for slugs the prefilter cannot see. generate_slug drops
+# non-ASCII letters it cannot fold (e.g. "Møller" -> "mller"), which only names
+# outside printable ASCII can hit; names with no letters, digits or symbol words
+# slug to UNNAMED_SLUG. The binary collation makes the bracket ranges code-point based.
+_BINARY_COLLATION = "Latin1_General_BIN"
+_COMPANY_NON_ASCII_NAME = Company.company_name.collate(_BINARY_COLLATION).like("%[^ -~]%")
+_COMPANY_NO_SLUG_CHARS_NAME = not_(Company.company_name.collate(_BINARY_COLLATION).like(
+    "%[a-zA-Z0-9" + "".join(symbol for symbol, _ in SLUG_SYMBOL_REPLACEMENTS) + "]%"
+))
+
+def _truncate(value: Optional[str]) -> Optional[str]:
+    """Trim long free-text fields for use in list descriptions"""
+    if not value:
+        return value
+    return value[:DESCRIPTION_MAX_LENGTH] + "..." if len(value) > DESCRIPTION_MAX_LENGTH else value
+
+def _build_description(
+    market_size: Optional[str],
+    company_size: Optional[str],
+    revenue_threshold: Optional[str],
+    pain_points: Optional[str],
+    buying_triggers: Optional[str]
+) -> str:
+    """
+    Create a list description from available company data, falling back to
+    pain points or buying triggers when no sizing data is present.
+    """
+    parts = [
+        f"{label}: {value}"
+        for label, value in (
+            ("Market Size", market_size),
+            ("Company Size", company_size),
+            ("Revenue", revenue_threshold),
+        )
+        if value
+    ]
+    if parts:
+        return " | ".join(parts)
+    return (
+        _truncate(pain_points)
+        or _truncate(buying_triggers)
+        or "Company profile information available"
+    )
+
+async def _stream_company_page(
+    db: AsyncSession,
+    query: Select,
+    with_total: bool
+) -> Tuple[List[bytes], Optional[int], Optional[Row]]:
+    """
+    Stream one page of company list rows and encode each item as it arrives, so the
+    page is never held as rows, Pydantic models and JSON all at once.
+    
+    Returns:
+    - Encoded items, the window total (if with_total and any rows), and the last row
+    """
+    # Local aliases keep global lookups out of the per-row loop
+    item_cls = CompanyListItemStruct
+    describe = _build_description
+    encode = _ITEM_ENCODER.encode
+    
+    result = await db.stream(query.execution_options(yield_per=50))
+    item_chunks = []
+    window_total = None
+    last_row = None
+    async for partition in result.partitions():
+        if window_total is None and with_total:
+            window_total = partition[0].total
+        last_row = partition[-1]
+        
+        if settings.use_stored_slugs:
+            # Rows written since the last backfill have no stored slug yet
+            slugs = [row.company_slug or generate_slug(row.company_name) for row in partition]
+        else:
+            # Generate slugs for the whole fetch batch at once
+            slugs = generate_slugs([row.company_name for row in partition])
+        item_chunks.extend([
+            encode(item_cls(
+                company_name=name,
+                company_website=website,
+                company_description=describe(market_size, company_size, revenue, pain_points, buying_triggers),
+                company_slug=slug
+            ))
+            for (name, website, market_size, company_size, revenue, pain_points, buying_triggers, *_), slug
+            in zip(partition, slugs)
+        ])
+    
+    return item_chunks, window_total, last_row
+
+async def _count_companies(count_query: Select) -> int:
+    """
+    Run a company count on its own session so it can overlap with other queries.
+    """
+    async with get_session_local("lead_generation")() as db:
+        result = await db.execute(count_query)
+        return result.scalar() or 0
+
+def _splice_companies(envelope: bytes, item_chunks: List[bytes]) -> bytes:
+    """
+    Insert pre-encoded company items into a serialized CompanyListResponse
+    envelope that was dumped without its companies field.
+    """
+    return envelope[:-1] + b',"companies":[' + b",".join(item_chunks) + b"]}"
+
+@retry_on_disconnect
+async def _load_company_list(
+    page: int,
+    per_page: int,
+    search: Optional[str],
+    after_name: Optional[str],
+    after_id: Optional[int]
+) -> bytes:
+    """
+    Query one page of the company list and return the response serialized as JSON.
+    """
+    async with get_session_local("lead_generation")() as db:
+        try:
+            # Validate pagination parameters
+            if per_page > settings.max_page_size:
+                per_page = settings.max_page_size
+            
+            # Calculate offset
+            offset = (page - 1) * per_page
+            
+            keyset = after_name is not None
+            
+            # Build base query; on OFFSET pages the window count returns the filtered total with every row
+            query = _COMPANY_SEEK_STMT if keyset else _COMPANY_PAGE_STMT
+            count_query = _COMPANY_COUNT_STMT
+            
+            # Apply search filter if provided; prefix searches can seek on the name index,
+            # a leading '%' asks for a substring match
+            if search:
+                search_filter = Company.company_name.like(f"{search}%")
+                query = query.where(search_filter)
+                count_query = count_query.where(search_filter)
+            
+            if keyset:
+                # Seek past the cursor on the indexed sort key instead of reading and discarding rows
+                cursor_filter = Company.company_name > after_name
+                if after_id is not None:
+                    cursor_filter = or_(
+                        cursor_filter,
+                        and_(Company.company_name == after_name, Company.co_rowid > after_id)
+                    )
+                query = query.where(cursor_filter)
+            else:
+                if page > 1:
+                    logger.warning("Offset pagination (page > 1) on /list is deprecated; use after_name/after_id")
+                query = query.offset(offset)
+            
+            # Get paginated results, with the total count in the same round-trip on OFFSET pages
+            query = query.order_by(*_COMPANY_LIST_ORDER).limit(per_page)
+            
+            if keyset:
+                # Keyset pages carry no window total; count on a second pooled connection
+                # while the page streams, so the request waits for the slower of the two.
+                # The task group cancels and awaits the sibling if either fails, so no
+                # query is still running on db when the handlers below roll it back.
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        page_task = tg.create_task(_stream_company_page(db, query, with_total=False))
+                        count_task = tg.create_task(_count_companies(count_query))
+                except ExceptionGroup as eg:
+                    raise eg.exceptions[0]
+                item_chunks, _, last_row = page_task.result()
+                total_count = count_task.result()
+            else:
+                item_chunks, window_total, last_row = await _stream_company_page(db, query, with_total=True)
+                if window_total is not None:
+                    total_count = window_total
+                elif page > 1:
+                    # Page is past the end, so no row carried the total; count separately
+                    total_result = await db.execute(count_query)
+                    total_count = total_result.scalar() or 0
+                else:
+                    total_count = 0
+            
+            # Calculate total pages
+            total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
+            
+            # Validate current page
+            if not keyset and page > total_pages and total_pages > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Page {page} does not exist. Total pages: {total_pages}"
+                )
+            
+            # A full page may have more rows after it; hand back its last key as the next cursor
+            if len(item_chunks) < per_page:
+                last_row = None
+            
+            # Prepare response
+            response = CompanyListResponse(
+                companies_total=total_count,
+                companies=[],
+                total_pages=total_pages,
+                current_page=page,
+                per_page=per_page,
+                next_after_name=last_row.company_name if last_row else None,
+                next_after_id=last_row.co_rowid if last_row else None
+            )
+            
+            return _splice_companies(response.model_dump_json(exclude={"companies"}).encode(), item_chunks)
+            
+        except HTTPException:
+            raise
+        except SQLAlchemyError as e:
+            logger.error(f"Database error in get_companies: {str(e)}")
+            await db.rollback()
+            if is_connection_invalidated(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error occurred while fetching companies"
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error in get_companies: {str(e)}")
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An unexpected error occurred"
+            )
+
+def _serialize_company(company: Company, slug: str) -> bytes:
+    """
+    Serialize company details for the slug lookup response.
+    """
+    return orjson.dumps({
+        "co_rowid": company.co_rowid,
+        "company_name": company.company_name,
+        "company_website": company.company_website,
+        "linkedin_company_url": company.linkedin_company_url,
+        "is_profiled": company.is_profiled,
+        "market_size": company.market_size,
+        "company_size": company.company_size,
+        "revenue_threshold": company.revenue_threshold,
+        "pain_points": company.pain_points,
+        "buying_triggers": company.buying_triggers,
+        "last_profiled_on": company.last_profiled_on,
+        "company_slug": slug
+    })
+
+@retry_on_disconnect
+async def _load_company_by_slug(slug: str) -> Optional[bytes]:
+    """
+    Find the company matching a slug and return its details serialized as JSON.
+    
+    Returns None if no company has the slug, so the miss can be cached as well.
+    """
+    pattern = slug_to_like_pattern(slug)
+    if pattern is None:
+        return None
+    
+    async with get_session_local("lead_generation")() as db:
+        try:
+            if settings.use_stored_slugs:
+                # Single-row seek on the unique slug index
+                result = await db.execute(_COMPANY_BY_SLUG_STMT.where(Company.company_slug == slug))
+                company = result.scalar_one_or_none()
+                if company is not None:
+                    return _serialize_company(company, slug)
+            
+            # Narrow candidates in SQL on the name with generate_slug's punctuation
+            # rewrites mirrored and accents ignored, then verify the slug in Python.
+            # Only if that finds nothing, check the names it cannot cover. Candidates
+            # are streamed so only one fetch batch is held in memory.
+            fallback_filter = _COMPANY_NON_ASCII_NAME
+            if slug == UNNAMED_SLUG:
+                fallback_filter = or_(fallback_filter, _COMPANY_NO_SLUG_CHARS_NAME)
+            candidate_queries = [
+                _COMPANY_SCAN_STMT.where(_COMPANY_SLUG_MATCH_NAME.like(pattern)),
+                _COMPANY_SCAN_STMT.where(fallback_filter)
+            ]
+            if settings.use_stored_slugs:
+                # Rows with a stored slug were settled by the seek above; only rows
+                # written since the last backfill can still match
+                candidate_queries = [query.where(Company.company_slug.is_(None)) for query in candidate_queries]
+            
+            # Candidate names are mostly one-offs; keep them out of the slug LRU cache
+            slugify = generate_slug.__wrapped__
+            for query in candidate_queries:
+                companies = await db.stream_scalars(query)
+                try:
+                    # Find company with matching slug
+                    async for company in companies:
+                        if slugify(company.company_name) == slug:
+                            return _serialize_company(company, slug)
+                finally:
+                    # Release the server cursor when returning before the last row
+                    await companies.close()
+            
+            return None
+            
+        except Exception as e:
+            logger.error(f"Error fetching company by slug: {str(e)}")
+            await db.rollback()
+            if is_connection_invalidated(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An error occurred while fetching company details"
+            )
 
 @router.get("/list", response_model=CompanyListResponse, status_code=status.HTTP_200_OK)
 async def get_companies(
     page: int = Query(default=1, ge=1, description="Page number"),
     per_page: int = Query(default=10, ge=1, le=100, description="Items per page"),
-    search: Optional[str] = Query(default=None, description="Search company name"),
-    db: AsyncSession = Depends(get_lead_db)
+    search: Optional[str] = Query(default=None, description="Search company name by prefix, or by substring with a leading '%'"),
+    after_name: Optional[str] = Query(default=None, description="Keyset cursor: return companies after this name"),
+    after_id: Optional[int] = Query(default=None, description="Keyset cursor tie-breaker: co_rowid of the last company seen")
 ):
     """
     Get paginated list of companies with slug generation.
@@ -31,112 +388,22 @@ async def get_companies(
     Parameters:
     - page: Page number (default: 1)
     - per_page: Number of items per page (default: 10, max: 100)
-    - search: Optional search term for company names
+    - search: Optional company name prefix; start with '%' to match anywhere in the name
+    - after_name / after_id: Keyset cursor from next_after_name / next_after_id of the
+      previous page. Preferred over page, whose OFFSET cost grows with depth.
     
     Returns:
     - Paginated list of companies with generated slugs
     """
-    try:
-        # Validate pagination parameters
-        if per_page > settings.max_page_size:
-            per_page = settings.max_page_size
-        
-        # Calculate offset
-        offset = (page - 1) * per_page
-        
-        # Build base query
-        base_query = select(Company)
-        count_query = select(func.count(Company.co_rowid))
-        
-        # Apply search filter if provided
-        if search:
-            search_term = f"%{search}%"
-            base_query = base_query.where(Company.company_name.ilike(search_term))
-            count_query = count_query.where(Company.company_name.ilike(search_term))
-        
-        # Get total count
-        total_result = await db.execute(count_query)
-        total_count = total_result.scalar() or 0
-        
-        # Calculate total pages
-        total_pages = math.ceil(total_count / per_page) if total_count > 0 else 0
-        
-        # Validate current page
-        if page > total_pages and total_pages > 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Page {page} does not exist. Total pages: {total_pages}"
-            )
-        
-        # Get paginated results
-        query = base_query.order_by(Company.company_name).offset(offset).limit(per_page)
-        result = await db.execute(query)
-        companies = result.scalars().all()
-        
-        # Process companies and generate slugs
-        company_list = []
-        for company in companies:
-            # Generate slug from company name
-            slug = generate_slug(company.company_name)
-            
-            # Create description from available data
-            description_parts = []
-            if company.market_size:
-                description_parts.append(f"Market Size: {company.market_size}")
-            if company.company_size:
-                description_parts.append(f"Company Size: {company.company_size}")
-            if company.revenue_threshold:
-                description_parts.append(f"Revenue: {company.revenue_threshold}")
-            
-            # If no specific data, use pain points or buying triggers as description
-            if not description_parts:
-                if company.pain_points:
-                    description = company.pain_points[:200] + "..." if len(company.pain_points) > 200 else company.pain_points
-                elif company.buying_triggers:
-                    description = company.buying_triggers[:200] + "..." if len(company.buying_triggers) > 200 else company.buying_triggers
-                else:
-                    description = "Company profile information available"
-            else:
-                description = " | ".join(description_parts)
-            
-            company_item = CompanyListItem(
-                company_name=company.company_name,
-                company_website=company.company_website,
-                company_description=description,
-                company_slug=slug
-            )
-            company_list.append(company_item)
-        
-        # Prepare response
-        response = CompanyListResponse(
-            companies_total=total_count,
-            companies=company_list,
-            total_pages=total_pages,
-            current_page=page,
-            per_page=per_page
-        )
-        
-        return response
-        
-    except HTTPException:
-        raise
-    except SQLAlchemyError as e:
-        logger.error(f"Database error in get_companies: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database error occurred while fetching companies"
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error in get_companies: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred"
-        )
+    content = await _company_list_cache.get_or_load(
+        (page, per_page, search, after_name, after_id),
+        lambda: _load_company_list(page, per_page, search, after_name, after_id)
+    )
+    return Response(content=content, media_type="application/json")
 
 @router.get("/company/{slug}", status_code=status.HTTP_200_OK)
 async def get_company_by_slug(
-    slug: str,
-    db: AsyncSession = Depends(get_lead_db)
+    slug: str
 ):
     """
     Get company details by slug.
@@ -147,39 +414,10 @@ async def get_company_by_slug(
     Returns:
     - Company details
     """
-    try:
-        # Get all companies to find matching slug
-        result = await db.execute(select(Company))
-        companies = result.scalars().all()
-        
-        # Find company with matching slug
-        for company in companies:
-            if generate_slug(company.company_name) == slug:
-                return {
-                    "co_rowid": company.co_rowid,
-                    "company_name": company.company_name,
-                    "company_website": company.company_website,
-                    "linkedin_company_url": company.linkedin_company_url,
-                    "is_profiled": company.is_profiled,
-                    "market_size": company.market_size,
-                    "company_size": company.company_size,
-                    "revenue_threshold": company.revenue_threshold,
-                    "pain_points": company.pain_points,
-                    "buying_triggers": company.buying_triggers,
-                    "last_profiled_on": company.last_profiled_on,
-                    "company_slug": slug
-                }
-        
+    content = await _company_detail_cache.get_or_load(slug, lambda: _load_company_by_slug(slug))
+    if content is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Company with slug '{slug}' not found"
         )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error fetching company by slug: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An error occurred while fetching company details"
-        )
\ No newline at end of file
+    return Response(content=content, media_type="application/json")
\ No newline at end of file
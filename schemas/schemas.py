@@ -1,8 +1,14 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Optional, List
+from datetime import date
+import msgspec
+
+# Immutable models without extra-field or assignment checks take pydantic-core's fastest path
+_MODEL_CONFIG = ConfigDict(from_attributes=True, extra='ignore', frozen=True, validate_assignment=False)
 
 class CompanyBase(BaseModel):
+    model_config = _MODEL_CONFIG
+    
     company_name: str
     company_website: Optional[str] = None
     linkedin_company_url: Optional[str] = None
@@ -12,41 +18,47 @@ class CompanyBase(BaseModel):
     revenue_threshold: Optional[str] = None
     pain_points: Optional[str] = None
     buying_triggers: Optional[str] = None
-    last_profiled_on: Optional[datetime] = None
+    last_profiled_on: Optional[date] = None
 
 class CompanyListItem(BaseModel):
     """Schema for company list response"""
+    model_config = _MODEL_CONFIG
+    
+    company_name: str
+    company_website: Optional[str] = None
+    company_description: Optional[str] = None
+    company_slug: str
+
+class CompanyListItemStruct(msgspec.Struct, frozen=True, kw_only=True):
+    """
+    Serialization-only mirror of CompanyListItem for the list hot path; encodes to the
+    same JSON without Pydantic's per-field Python work. Keep fields in sync.
+    """
     company_name: str
     company_website: Optional[str] = None
     company_description: Optional[str] = None
     company_slug: str
-    
-    class Config:
-        from_attributes = True
 
 class CompanyListResponse(BaseModel):
     """Paginated company list response"""
+    model_config = _MODEL_CONFIG
+    
     companies_total: int = Field(description="Total number of companies")
     companies: List[CompanyListItem] = Field(description="List of companies")
     total_pages: int = Field(description="Total number of pages")
     current_page: int = Field(description="Current page number")
     per_page: int = Field(description="Items per page")
-    
-    @validator('companies_total', 'total_pages', 'current_page', 'per_page', pre=True)
-    def convert_to_int(cls, v):
-        """Ensure integer fields are properly typed"""
-        return int(v) if v is not None else 0
+    next_after_name: Optional[str] = Field(default=None, description="Keyset cursor for the next page")
+    next_after_id: Optional[int] = Field(default=None, description="Keyset cursor tie-breaker for the next page")
+
+# Constraints are enforced by pydantic-core; out-of-range values fail validation
+Page = Annotated[int, Field(ge=1, description="Page number")]
+PerPage = Annotated[int, Field(ge=1, le=100, description="Items per page")]
 
 class PaginationParams(BaseModel):
     """Pagination parameters"""
-    page: int = Field(default=1, ge=1, description="Page number")
-    per_page: int = Field(default=10, ge=1, le=100, description="Items per page")
-    search: Optional[str] = Field(default=None, description="Search term for company name")
+    model_config = _MODEL_CONFIG
     
-    @validator('per_page')
-    def validate_per_page(cls, v):
-        if v > 100:
-            return 100
-        if v < 1:
-            return 10
-        return v
\ No newline at end of file
+    page: Page = 1
+    per_page: PerPage = 10
+    search: Optional[str] = Field(default=None, description="Search term for company name")
\ No newline at end of file
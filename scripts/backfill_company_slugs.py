@@ -0,0 +1,71 @@
+"""
+Populate dbo.company.company_slug for rows that do not have one yet.
+
+Run after adding the column (and again after bulk imports), then enable
+USE_STORED_SLUGS:
+
+    ALTER TABLE dbo.company ADD company_slug NVARCHAR(600) NULL;
+    CREATE UNIQUE INDEX ix_company_slug ON dbo.company(company_slug)
+        WHERE company_slug IS NOT NULL;
+
+    python -m scripts.backfill_company_slugs
+"""
+import asyncio
+import logging
+
+from sqlalchemy import select, update
+
+from db.session import dispose_engines, get_session_local
+from models.models import Company
+from utils.slug_utils import generate_slugs_bulk, generate_unique_slugs
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+async def backfill_company_slugs(db_key: str = "lead_generation") -> int:
+    """
+    Assign unique slugs to every company missing one. Each company gets its
+    natural slug when free; suffixes go to the duplicates, in co_rowid order.
+    
+    Returns:
+        Number of companies updated
+    """
+    session_local = get_session_local(db_key)
+    async with session_local() as db:
+        result = await db.execute(
+            select(Company.co_rowid, Company.company_name, Company.company_slug).order_by(Company.co_rowid)
+        )
+        rows = result.all()
+        
+        existing_slugs = {row.company_slug for row in rows if row.company_slug}
+        missing = [row for row in rows if not row.company_slug]
+        slugs = generate_unique_slugs(
+            generate_slugs_bulk([row.company_name for row in missing]),
+            existing_slugs
+        )
+        
+        for start in range(0, len(missing), BATCH_SIZE):
+            batch = zip(missing[start:start + BATCH_SIZE], slugs[start:start + BATCH_SIZE])
+            await db.execute(
+                update(Company),
+                [{"co_rowid": row.co_rowid, "company_slug": slug} for row, slug in batch]
+            )
+            await db.commit()
+            logger.info(f"Backfilled slugs for {min(start + BATCH_SIZE, len(missing))}/{len(missing)} companies")
+    
+    return len(missing)
+
+async def main() -> None:
+    try:
+        updated = await backfill_company_slugs()
+        logger.info(f"Slug backfill complete: {updated} companies updated")
+    finally:
+        await dispose_engines()
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    asyncio.run(main())
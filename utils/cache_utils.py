@@ -0,0 +1,59 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+from cachetools import TTLCache
+
+_MISSING = object()
+
+def _entry_size(value: Optional[bytes]) -> int:
+    """Bytes charged to the cache for an entry; cached misses count as 1"""
+    return len(value) if value else 1
+
+class AsyncTTLCache:
+    """
+    In-process TTL cache for serialized responses, bounded by the total size
+    of the cached bodies rather than the number of entries.
+    
+    Concurrent misses on the same key share one in-flight load, so the loader
+    runs once per expiry and every waiting request gets its result or its
+    exception. A loader may return None for "not found"; that is cached too,
+    so repeated lookups of a missing key do not reach the database until it
+    expires.
+    """
+    
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, ttl: float = 60):
+        self._values: TTLCache = TTLCache(maxsize=max_bytes, ttl=ttl, getsizeof=_entry_size)
+        self._loads: Dict[Hashable, asyncio.Task] = {}
+    
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        """
+        Return the cached value for key, calling loader to fill it on a miss.
+        
+        Args:
+            key: Hashable cache key
+            loader: Coroutine factory producing the value, or None if there is
+                none; exceptions are not cached, but are raised to every
+                request waiting on the same load
+            
+        Returns:
+            Cached or freshly loaded value
+        """
+        value = self._values.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        task = self._loads.get(key)
+        if task is None:
+            task = self._loads[key] = asyncio.ensure_future(self._load(key, loader))
+        # Shielded so one disconnecting client does not cancel the load for the others
+        return await asyncio.shield(task)
+    
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+        """Run loader once for key and store its value"""
+        try:
+            value = await loader()
+            # A body larger than the whole budget is served but not cached
+            if _entry_size(value) <= self._values.maxsize:
+                self._values[key] = value
+            return value
+        finally:
+            self._loads.pop(key, None)
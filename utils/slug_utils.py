@@ -1,11 +1,55 @@
 import re
-from typing import Optional
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
 import unicodedata
 
+# Compiled once at import instead of looked up in re's pattern cache per call
+_RE_VALID_SLUG = re.compile(r'[a-z0-9]+(-[a-z0-9]+)*')
+
+# Byte tables for the ASCII stage of generate_slug: whitespace (as matched by
+# str's \s) becomes a hyphen, and everything except a-z, 0-9 and separators is
+# deleted, all in one bytes.translate pass
+_WHITESPACE_BYTES = bytes(c for c in range(128) if chr(c).isspace())
+_SEPARATOR_TABLE = bytes.maketrans(_WHITESPACE_BYTES, b'-' * len(_WHITESPACE_BYTES))
+_SLUG_BYTES = b'abcdefghijklmnopqrstuvwxyz0123456789-' + _WHITESPACE_BYTES
+_NON_SLUG_BYTES = bytes(c for c in range(256) if c not in _SLUG_BYTES)
+
+# Common symbols replaced with text equivalents, applied in a single translate pass
+_SYMBOL_WORDS = {
+    '&': 'and',
+    '@': 'at',
+    '#': 'number',
+    '$': 'dollar',
+    '%': 'percent',
+    '+': 'plus',
+}
+_SYMBOL_TABLE = str.maketrans({symbol: f' {word} ' for symbol, word in _SYMBOL_WORDS.items()})
+
+# What generate_slug does to punctuation, for SQL prefilters that need to mirror it:
+# symbols become their words, and other ASCII punctuation plus typographic quotes
+# and dashes are deleted. Hyphens and whitespace only separate tokens, so neither
+# is listed.
+SLUG_SYMBOL_REPLACEMENTS = tuple(_SYMBOL_WORDS.items())
+SLUG_DELETED_CHARS = ''.join(
+    char for char in string.punctuation + '\u2018\u2019\u201c\u201d\u2013\u2014'
+    if char != '-' and char not in _SYMBOL_WORDS
+)
+
+# Slug for names with no slug characters at all, e.g. "!!!"
+UNNAMED_SLUG = 'unnamed'
+
+# Company names repeat heavily across list pages and searches
+SLUG_CACHE_SIZE = 8192
+
+@lru_cache(maxsize=SLUG_CACHE_SIZE)
 def generate_slug(text: Optional[str]) -> str:
     """
     Generate a URL-friendly slug from text.
     
+    Results are memoized per input (see SLUG_CACHE_SIZE); the function is pure,
+    so repeated names skip normalization and regex work entirely.
+    
     Args:
         text: Input text to convert to slug
         
@@ -14,8 +58,8 @@ def generate_slug(text: Optional[str]) -> str:
         
     Examples:
         "Cedar Financial" -> "cedar-financial"
-        "Tech@Corp Solutions!" -> "techcorp-solutions"
-        "ABC & XYZ Company" -> "abc-xyz-company"
+        "Tech@Corp Solutions!" -> "tech-at-corp-solutions"
+        "ABC & XYZ Company" -> "abc-and-xyz-company"
     """
     if not text:
         return ""
@@ -23,50 +67,75 @@ def generate_slug(text: Optional[str]) -> str:
     # Convert to lowercase
     text = text.lower()
     
-    # Remove accents and convert to ASCII
-    text = unicodedata.normalize('NFKD', text)
-    text = text.encode('ascii', 'ignore').decode('ascii')
+    # Remove accents and convert to ASCII; NFKD leaves ASCII unchanged, so skip it
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = text.encode('ascii', 'ignore').decode('ascii')
     
     # Replace common symbols with text equivalents
-    replacements = {
-        '&': 'and',
-        '@': 'at',
-        '#': 'number',
-        '$': 'dollar',
-        '%': 'percent',
-        '+': 'plus',
-    }
-    
-    for symbol, replacement in replacements.items():
-        text = text.replace(symbol, f' {replacement} ')
-    
-    # Remove all non-alphanumeric characters except spaces and hyphens
-    text = re.sub(r'[^a-z0-9\s-]', '', text)
+    text = text.translate(_SYMBOL_TABLE)
     
-    # Replace multiple spaces with single space
-    text = re.sub(r'\s+', ' ', text)
+    # Remove all non-alphanumeric characters except separators, turning whitespace
+    # into hyphens; the text is pure ASCII at this point
+    data = text.encode('ascii').translate(_SEPARATOR_TABLE, _NON_SLUG_BYTES)
     
-    # Strip leading/trailing whitespace
-    text = text.strip()
+    # Collapse each run of hyphens into one and trim the ends by dropping empty parts
+    text = b'-'.join([part for part in data.split(b'-') if part]).decode('ascii')
     
-    # Replace spaces with hyphens
-    text = text.replace(' ', '-')
+    return text or UNNAMED_SLUG
+
+def generate_slugs(names: Iterable[Optional[str]]) -> List[str]:
+    """
+    Generate slugs for a batch of names in one call.
     
-    # Remove multiple consecutive hyphens
-    text = re.sub(r'-+', '-', text)
+    Args:
+        names: Input texts to convert, e.g. one fetched page of company names
+        
+    Returns:
+        Slugs in the same order as names, identical to calling generate_slug on each
+    """
+    slug = generate_slug
+    return [slug(name) for name in names]
+
+def generate_slugs_bulk(names: Iterable[Optional[str]]) -> List[str]:
+    """
+    Generate slugs for a large one-off batch, e.g. a company import.
     
-    # Remove leading/trailing hyphens
-    text = text.strip('-')
+    Bypasses generate_slug's LRU cache so thousands of unique names do not evict
+    the entries hot list pages rely on; duplicates within the batch are still
+    slugified only once.
     
-    return text or 'unnamed'
+    Args:
+        names: Input texts to convert
+        
+    Returns:
+        Slugs in the same order as names, identical to calling generate_slug on each
+    """
+    slugify = generate_slug.__wrapped__
+    seen: Dict[Optional[str], str] = {}
+    slugs = []
+    for name in names:
+        slug = seen.get(name)
+        if slug is None:
+            slug = seen[name] = slugify(name)
+        slugs.append(slug)
+    return slugs
 
-def generate_unique_slug(base_slug: str, existing_slugs: set) -> str:
+def generate_unique_slug(
+    base_slug: str,
+    existing_slugs: set,
+    next_suffix: Optional[Dict[str, int]] = None
+) -> str:
     """
     Generate a unique slug by appending a number if necessary.
     
     Args:
         base_slug: The base slug to start with
         existing_slugs: Set of existing slugs to check against
+        next_suffix: Optional map of base slug -> next suffix to try, kept by the
+            caller across calls so repeated collisions on the same base resume
+            where the last one stopped instead of probing from 1 again. Only
+            valid while every returned slug is also added to existing_slugs.
         
     Returns:
         Unique slug string
@@ -74,8 +143,75 @@ def generate_unique_slug(base_slug: str, existing_slugs: set) -> str:
     if base_slug not in existing_slugs:
         return base_slug
     
-    counter = 1
-    while f"{base_slug}-{counter}" in existing_slugs:
+    counter = next_suffix.get(base_slug, 1) if next_suffix is not None else 1
+    candidate = f"{base_slug}-{counter}"
+    while candidate in existing_slugs:
         counter += 1
+        candidate = f"{base_slug}-{counter}"
+    
+    if next_suffix is not None:
+        next_suffix[base_slug] = counter + 1
+    
+    return candidate
+
+def generate_unique_slugs(base_slugs: Sequence[str], existing_slugs: set) -> List[str]:
+    """
+    Generate unique slugs for a batch, e.g. when seeding the company table.
+    
+    Resolved in two passes: every base slug that is free (not in existing_slugs
+    and not claimed earlier in the batch) is kept as is first, then only the
+    collisions get numeric suffixes. A suffixed slug therefore never takes a
+    later entry's own base slug, e.g. ["acme", "acme", "acme-1"] gives
+    ["acme", "acme-2", "acme-1"]. Each emitted slug is added to existing_slugs
+    in place.
+    
+    Args:
+        base_slugs: Base slugs to make unique, in order
+        existing_slugs: Set of existing slugs to check against; updated in place
+        
+    Returns:
+        Unique slugs in the same order as base_slugs
+    """
+    unique_slugs: List[Optional[str]] = []
+    for base_slug in base_slugs:
+        if base_slug in existing_slugs:
+            unique_slugs.append(None)
+        else:
+            existing_slugs.add(base_slug)
+            unique_slugs.append(base_slug)
+    
+    next_suffix: Dict[str, int] = {}
+    for index, base_slug in enumerate(base_slugs):
+        if unique_slugs[index] is None:
+            slug = generate_unique_slug(base_slug, existing_slugs, next_suffix)
+            existing_slugs.add(slug)
+            unique_slugs[index] = slug
+    return unique_slugs
+
+def slug_to_like_pattern(slug: str) -> Optional[str]:
+    """
+    Build a SQL LIKE pattern that narrows company names to likely matches for a slug.
+    
+    Each slug token must appear in order in the name. The pattern is meant to be
+    matched against the name with SLUG_SYMBOL_REPLACEMENTS and SLUG_DELETED_CHARS
+    applied under an accent-insensitive collation, so punctuation inside a word
+    and accents do not hide a match. Non-ASCII letters that generate_slug drops
+    (e.g. "ø", "ß") and names that slug to UNNAMED_SLUG can still miss, so callers
+    need a fallback for those, and every candidate must be verified with
+    generate_slug.
+    
+    Args:
+        slug: Slug to build the pattern for
+        
+    Returns:
+        Case-insensitive LIKE pattern, or None if the slug can never be produced
+        by generate_slug
+        
+    Examples:
+        "cedar-financial" -> "%cedar%financial%"
+        "abc-and-xyz-company" -> "%abc%and%xyz%company%"
+    """
+    if not slug or not _RE_VALID_SLUG.fullmatch(slug):
+        return None
     
-    return f"{base_slug}-{counter}"
\ No newline at end of file
+    return '%' + '%'.join(slug.split('-')) + '%'